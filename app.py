@@ -1,9 +1,21 @@
 import os
-from flask import Flask, render_template, request, jsonify, session, Response, render_template_string
+from flask import Flask, render_template, request, jsonify, session, Response, render_template_string, url_for, abort
+from werkzeug.http import parse_cookie
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.wrappers import Response as WSGIResponse
+import click
 import requests
 import random
+import re
+import base64
+import gzip
+import hashlib
+import math
+import secrets
+import sqlite3
 import time
-from threading import Lock
+from collections import OrderedDict
+from threading import Lock, Thread, local
 
 # Only load dotenv in development
 if os.getenv('VERCEL_ENV') is None:  # We're in development
@@ -22,6 +34,329 @@ print(f"API Key loaded: {'*' * len(WORDS_API_KEY) if WORDS_API_KEY else 'None'}"
 word_cache = []
 cache_lock = Lock()
 
+# Held while fetching words, so only one refill runs at a time
+refill_lock = Lock()
+
+# Refill the cache in the background once it is down to this many rounds
+CACHE_LOW_WATERMARK = 5
+
+# Rate limits per endpoint as (burst capacity, tokens refilled per second).
+# Per-IP buckets are IP_LIMIT_MULTIPLIER times larger since players can share an IP.
+RATE_LIMITS = {
+    '/api/process-input': (10, 2.0),
+    '/api/next-synonym': (6, 1.0),
+    '/api/start-game': (5, 0.2),
+    '/api/toggle-game': (5, 0.2)
+}
+IP_LIMIT_MULTIPLIER = 5
+NEW_GAME_PATHS = {'/api/start-game', '/api/toggle-game'}
+
+# Above this many in-flight game requests in one worker process, shed new games
+# and cookieless clients. The count is not shared between processes or instances,
+# so it only kicks in for threaded servers (Vercel runs one request per instance).
+WORKER_LOAD_SHED_THRESHOLD = int(os.getenv('WORKER_LOAD_SHED_THRESHOLD', '32'))
+
+# Number of proxies whose X-Forwarded-For can be trusted for the client address.
+# Vercel's edge overwrites the header, so it is trusted there by default; anywhere
+# else it is ignored unless configured, as clients can spoof it.
+TRUSTED_PROXIES = int(os.getenv('TRUSTED_PROXIES', '0' if os.getenv('VERCEL_ENV') is None else '1'))
+
+# Optional SQLite file so worker processes on one host share rate limit buckets
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB')
+
+# Stable per-browser id, since the signed session cookie changes on every write
+PLAYER_COOKIE = 'player_id'
+
+# Static assets are served from /assets/ with a content hash in the filename
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+ASSET_TYPES = {'.css': 'text/css', '.js': 'text/javascript'}
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# HTML shells reference hashed assets, so only cache them briefly
+PAGE_CACHE_CONTROL = 'public, max-age=300'
+
+HTMX_VERSION = '1.9.10'
+HTMX_URL = f"https://unpkg.com/htmx.org@{HTMX_VERSION}/dist/htmx.min.js"
+# Published subresource integrity hash of htmx.min.js 1.9.10
+HTMX_INTEGRITY = 'sha384-D1Kt99CQMDuVetoL1lrYwg5t+9QdHe7NLX/SoJYkXDFfX37iInKRy5xLSi8nO7UC'
+
+# CDN URL and integrity hash, used until the vendored copy exists
+ASSET_FALLBACKS = {'js/htmx.min.js': (HTMX_URL, HTMX_INTEGRITY)}
+
+RATE_LIMITED_MESSAGE = "Slow down! Please wait a moment before trying again."
+OVERLOADED_MESSAGE = "The game is busy right now. Please try again in a moment."
+
+REJECTED_FRAGMENT = """
+    <div class="error-message">{message}</div>
+"""
+
+REJECTED_NEW_GAME_FRAGMENT = """
+    <div class="rules-section">
+        <div class="error-message">
+            {message}
+        </div>
+        <div id="game-buttons">
+            <button class="game-button" 
+                    hx-post="/api/toggle-game"
+                    hx-target="#game-buttons"
+                    hx-swap="innerHTML">
+                Try Again
+            </button>
+        </div>
+    </div>
+"""
+
+def take_token(tokens, updated, capacity, refill_rate, now):
+    """Refill a token bucket and try to take one token from it
+    
+    Returns whether a token was taken and the bucket's new token count.
+    """
+    tokens = min(capacity, tokens + (now - updated) * refill_rate)
+    if tokens < 1:
+        return False, tokens
+    return True, tokens - 1
+
+class TokenBucketLimiter:
+    """In-process token buckets keyed by arbitrary strings"""
+    
+    # Least recently used buckets are dropped beyond this many, so rotating
+    # cookies or addresses can't grow memory or slow down lookups
+    MAX_BUCKETS = 10000
+    
+    def __init__(self):
+        self.buckets = OrderedDict()
+        self.lock = Lock()
+    
+    def allow(self, key, capacity, refill_rate):
+        """Take a token from the key's bucket, returning False if it is empty"""
+        return self.allow_all([(key, capacity, refill_rate)])
+    
+    def allow_all(self, buckets):
+        """Take a token from each (key, capacity, refill_rate) bucket in turn
+        
+        Stops at the first empty bucket and returns False.
+        """
+        now = time.time()
+        with self.lock:
+            for key, capacity, refill_rate in buckets:
+                tokens, updated = self.buckets.get(key, (capacity, now))
+                allowed, tokens = take_token(tokens, updated, capacity, refill_rate, now)
+                self.buckets[key] = (tokens, now)
+                self.buckets.move_to_end(key)
+                
+                if len(self.buckets) > self.MAX_BUCKETS:
+                    self.buckets.popitem(last=False)
+                if not allowed:
+                    return False
+        return True
+
+class SQLiteTokenBucketLimiter:
+    """Token buckets shared between worker processes through a local SQLite file"""
+    
+    # Every this many calls, delete buckets idle longer than IDLE_SECONDS
+    CLEANUP_EVERY = 1000
+    IDLE_SECONDS = 300
+    
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+        self.connections = local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+    
+    def _connect(self):
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self.connections, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            # Buckets are throwaway data, so trade durability for cheap writes
+            # that don't block readers in other workers
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self.connections.conn = conn
+        return conn
+    
+    def allow(self, key, capacity, refill_rate):
+        """Take a token from the key's bucket, returning False if it is empty"""
+        return self.allow_all([(key, capacity, refill_rate)])
+    
+    def allow_all(self, buckets):
+        """Take a token from each (key, capacity, refill_rate) bucket in turn
+        
+        Stops at the first empty bucket and returns False. All buckets are
+        checked in a single write transaction.
+        """
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                allowed = True
+                for key, capacity, refill_rate in buckets:
+                    row = conn.execute(
+                        "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+                    ).fetchone()
+                    tokens, updated = row if row else (capacity, now)
+                    allowed, tokens = take_token(tokens, updated, capacity, refill_rate, now)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                        (key, tokens, now)
+                    )
+                    if not allowed:
+                        break
+                
+                self.calls += 1
+                if self.calls % self.CLEANUP_EVERY == 0:
+                    conn.execute("DELETE FROM buckets WHERE updated < ?",
+                                 (now - self.IDLE_SECONDS,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return allowed
+        except sqlite3.Error as e:
+            # Fail open rather than locking players out
+            print(f"Rate limit backend error: {str(e)}")
+            return True
+
+class RateLimitMiddleware:
+    """WSGI middleware rejecting excess game requests early
+    
+    Runs before Flask loads the session or renders anything, so rejected
+    requests cost a cookie parse and a bucket lookup.
+    """
+    
+    def __init__(self, wsgi_app, limiter):
+        self.wsgi_app = wsgi_app
+        self.limiter = limiter
+        self.in_flight = 0
+        self.lock = Lock()
+    
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        limits = RATE_LIMITS.get(path)
+        if limits is None:
+            return self.wsgi_app(environ, start_response)
+        
+        player_id = parse_cookie(environ).get(PLAYER_COOKIE)
+        rejection = self.check(environ, path, limits, player_id)
+        if rejection is not None:
+            return rejection(environ, start_response)
+        
+        with self.lock:
+            self.in_flight += 1
+        try:
+            return self.wsgi_app(environ, start_response)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+    
+    def check(self, environ, path, limits, player_id):
+        """Return a rejection response for the request, or None to let it through"""
+        # When overloaded, keep serving players already mid-game
+        if self.in_flight >= WORKER_LOAD_SHED_THRESHOLD and (not player_id or path in NEW_GAME_PATHS):
+            print(f"Shedding {path} with {self.in_flight} requests in flight")
+            return self.reject(path, 503, OVERLOADED_MESSAGE, retry_after=5)
+        
+        capacity, refill_rate = limits
+        # ProxyFix has already applied any trusted X-Forwarded-For
+        ip = environ.get('REMOTE_ADDR', '')
+        
+        buckets = [(f"ip:{ip}:{path}",
+                    capacity * IP_LIMIT_MULTIPLIER,
+                    refill_rate * IP_LIMIT_MULTIPLIER)]
+        if player_id:
+            buckets.append((f"player:{player_id}:{path}", capacity, refill_rate))
+        
+        if not self.limiter.allow_all(buckets):
+            return self.reject(path, 429, RATE_LIMITED_MESSAGE,
+                               retry_after=math.ceil(1 / refill_rate))
+        return None
+    
+    def reject(self, path, status, message, retry_after):
+        """Build an htmx fragment response for a rejected request"""
+        headers = {"Retry-After": str(retry_after), "HX-Reswap": "innerHTML"}
+        
+        if path in NEW_GAME_PATHS:
+            # Replace the game area so the player gets a button to retry with
+            body = REJECTED_NEW_GAME_FRAGMENT.format(message=message)
+            headers["HX-Retarget"] = "#game-area"
+        else:
+            body = REJECTED_FRAGMENT.format(message=message)
+            headers["HX-Retarget"] = "#game-status"
+        
+        return WSGIResponse(body, status=status, headers=headers, mimetype='text/html')
+
+# Minimum number of word clues (synonyms plus related words) for a usable word
+MIN_CLUES = 5
+
+# Related clues ride along in the session cookie, so keep only the best few
+MAX_RELATED = 20
+
+def _unique(words, exclude=()):
+    """Dedupe a list of words, preserving order and skipping excluded ones"""
+    seen = set(exclude)
+    unique = []
+    for w in words:
+        if w not in seen:
+            seen.add(w)
+            unique.append(w)
+    return unique
+
+def mask_word(text, word):
+    """Blank out the target word (and its inflections) in a clue"""
+    return re.sub(rf"\b{re.escape(word)}\w*", "____", text, flags=re.IGNORECASE)
+
+def normalize_word_details(word, details):
+    """Normalize a WordsAPI /words/{word} payload into a word cache entry
+    
+    The sense with the most synonyms supplies the primary synonyms. Synonyms
+    of the other senses plus similarTo/typeOf words become extra related clues
+    (at most MAX_RELATED, best first), and the primary sense's definition is
+    kept as a hint, so a round can keep going after the synonyms run out
+    without any further API calls.
+    """
+    senses = [{
+        'part_of_speech': r.get('partOfSpeech'),
+        'definition': r.get('definition'),
+        'synonyms': r.get('synonyms', []),
+        'similar_to': r.get('similarTo', []),
+        'type_of': r.get('typeOf', [])
+    } for r in details.get('results', [])]
+    
+    # Get all senses that have synonyms other than the word itself
+    senses_with_synonyms = [(s, _unique(s['synonyms'], exclude=[word])) for s in senses
+                            if s['part_of_speech']]
+    senses_with_synonyms = [(s, syns) for s, syns in senses_with_synonyms if syns]
+    if not senses_with_synonyms:
+        return None
+    
+    # Choose sense with most synonyms
+    primary, synonyms = max(senses_with_synonyms, key=lambda pair: len(pair[1]))
+    
+    # Other senses' synonyms first (same part of speech before the rest),
+    # then looser similarTo/typeOf words
+    others = sorted((s for s in senses if s is not primary),
+                    key=lambda s: s['part_of_speech'] != primary['part_of_speech'])
+    candidates = [w for s in others for w in s['synonyms']]
+    candidates += [w for s in senses for w in s['similar_to']]
+    candidates += [w for s in senses for w in s['type_of']]
+    related = [w for w in _unique(candidates, exclude=synonyms + [word])
+               if word.lower() not in w.lower().split()][:MAX_RELATED]
+    
+    definition = primary['definition']
+    return {
+        'word': word,
+        'part_of_speech': primary['part_of_speech'],
+        'synonyms': synonyms,
+        'related': related,
+        'definition': mask_word(definition, word) if definition else None,
+        'frequency': details.get('frequency'),
+        'senses': senses
+    }
+
 def get_random_word():
     """Get a random word from the API synchronously"""
     url = f"https://{WORDS_API_HOST}/words/"
@@ -36,7 +371,7 @@ def get_random_word():
     }
     
     try:
-        # Try up to 3 times to get a word with enough synonyms
+        # Try up to 3 times to get a word with enough clues
         for _ in range(3):
             response = requests.get(url, headers=headers, params=params)
             print(f"API Response status: {response.status_code}")
@@ -51,26 +386,11 @@ def get_random_word():
                 details_response = requests.get(details_url, headers=headers)
                 
                 if details_response.status_code == 200:
-                    details = details_response.json()
-                    results = details.get('results', [])
-                    print(f"Results count: {len(results)}")
-                    
-                    # Get all results that have synonyms
-                    results_with_synonyms = [r for r in results 
-                                           if r.get('synonyms') and r.get('partOfSpeech')]
+                    word_data = normalize_word_details(word, details_response.json())
+                    print(f"Senses count: {len(word_data['senses']) if word_data else 0}")
                     
-                    if results_with_synonyms:
-                        # Choose result with most synonyms
-                        result = max(results_with_synonyms, 
-                                   key=lambda x: len(x.get('synonyms', [])))
-                        synonyms = result.get('synonyms', [])
-                        
-                        if len(synonyms) >= 5:
-                            return {
-                                'word': word,
-                                'part_of_speech': result.get('partOfSpeech'),
-                                'synonyms': synonyms
-                            }
+                    if word_data and len(word_data['synonyms']) + len(word_data['related']) >= MIN_CLUES:
+                        return word_data
             
             # Small delay between attempts
             time.sleep(0.1)
@@ -95,30 +415,296 @@ def get_multiple_words(count=5):
     
     return words
 
-def ensure_word_cache():
-    """Ensure we have enough words in the cache"""
-    global word_cache
+# Initial game UI for a round, with the first clue already showing
+ROUND_TEMPLATE = """
+    <!-- Game Area -->
+    <div class="game-container">
+        <!-- Display Area -->
+        <div class="display-section">
+            <h2 class="section-heading">The target word part of speech is {{ part_of_speech }}</h2>
+            <h2 class="section-heading">The synonyms are:</h2>
+            <div id="display-area"
+                 hx-trigger="every 7s"
+                 hx-post="/api/next-synonym"
+                 hx-swap="innerHTML">
+                <div class="synonyms-container">
+                    <div class="synonyms-column">
+                        <span class="synonym-word">{{ first_clue }}</span>
+                    </div>
+                    <div class="synonyms-column">
+                    </div>
+                </div>
+                <div class="synonym-counter">Remaining clues: {{ remaining }}</div>
+            </div>
+        </div>
+
+        <!-- Game Status -->
+        <div id="game-status"></div>
+
+        <!-- Input Area -->
+        <div class="input-section">
+            <h2>Guess the common parent word</h2>
+            <form hx-post="/api/process-input" 
+                  hx-target="#input-result"
+                  hx-on::after-request="this.reset()">
+                <input type="text" 
+                       name="text" 
+                       placeholder="Enter text here..."
+                       pattern="[A-Za-z]+"
+                       title="Please enter only alphabetic characters"
+                       required>
+                <button type="submit">Submit</button>
+            </form>
+            <div id="input-result"></div>
+        </div>
+
+        <!-- Game Control Section -->
+        <div class="game-control-section">
+            <div id="game-buttons">
+                <button class="game-button reset" 
+                        hx-post="/api/toggle-game"
+                        hx-target="#game-buttons"
+                        hx-swap="innerHTML">
+                    Reset
+                </button>
+            </div>
+        </div>
+    </div>
+    """
+
+def build_round_bundle(word_data):
+    """Prebuild a ready-to-serve round for a word
     
+    Picks the first clue and renders the initial game UI up front, so starting
+    the round is just copying the compact state into the session. The full
+    normalized word details are kept alongside for later clue types.
+    """
+    synonyms = word_data['synonyms']
+    related = word_data.get('related', [])
+    first_clue = random.choice(synonyms)
+    
+    with app.app_context():
+        html = render_template_string(
+            ROUND_TEMPLATE,
+            part_of_speech=word_data['part_of_speech'],
+            first_clue=first_clue,
+            remaining=len(synonyms) + len(related) - 1
+        )
+    
+    return {
+        'word': word_data['word'],
+        'state': {
+            'target_word': word_data['word'],
+            'synonyms': synonyms,
+            'related': related,
+            'definition': word_data.get('definition'),
+            'part_of_speech': word_data['part_of_speech'],
+            'displayed_synonyms': [first_clue]
+        },
+        'html': html,
+        # Full normalized record (senses, frequency, ...) stays server-side
+        'details': word_data
+    }
+
+def pop_round_bundle():
+    """Take the next prebuilt round from the cache, if one is ready"""
     with cache_lock:
-        cache_size = len(word_cache)
+        return word_cache.pop(0) if word_cache else None
+
+def start_round(bundle):
+    """Start a prebuilt round in the session and return its game UI"""
+    print(f"\nUsing word from cache: {bundle['word']}")
+    print(f"Cache size after pop: {len(word_cache)}")
+    
+    # Set up new game state
+    session.update(bundle['state'])
+    session['definition_shown'] = False
+    session['game_active'] = True
+    session['guesses'] = []
+    
+    # Initialize multi-round stats if not exists
+    if 'correct_words' not in session:
+        session['correct_words'] = []
+        session['current_round'] = 1
+    
+    session.modified = True
+    
+    # Get the next rounds ready before anyone asks for them
+    prefetch_word_cache()
+    
+    return Response(
+        bundle['html'],
+        headers={
+            "HX-Retarget": "#game-area",
+            "HX-Reswap": "innerHTML"
+        }
+    )
+
+def refill_word_cache():
+    """Top up the cache with prebuilt rounds when it is running low
+    
+    Words are fetched without holding cache_lock, so rounds already in the
+    cache can still be served while a refill is in progress.
+    """
+    with refill_lock:
+        with cache_lock:
+            cache_size = len(word_cache)
         print(f"\nChecking word cache. Current size: {cache_size}")
         
         if cache_size == 0:
             print("Cache empty. Getting words...")
-            new_words = get_multiple_words(10)
-            word_cache.extend(new_words)
-            return bool(word_cache)
-            
-        elif cache_size <= 5:
+            count = 10
+        elif cache_size <= CACHE_LOW_WATERMARK:
             print(f"Cache low ({cache_size} words). Adding 5 more...")
-            new_words = get_multiple_words(5)
-            word_cache.extend(new_words)
+            count = 5
+        else:
+            return
         
-        return True
+        bundles = [build_round_bundle(w) for w in get_multiple_words(count)]
+        with cache_lock:
+            word_cache.extend(bundles)
+
+def ensure_word_cache():
+    """Ensure we have enough prebuilt rounds in the cache"""
+    refill_word_cache()
+    with cache_lock:
+        return bool(word_cache)
+
+def prefetch_word_cache():
+    """Refill a low cache in a background thread, off the response path"""
+    if len(word_cache) > CACHE_LOW_WATERMARK or refill_lock.locked():
+        return
+    Thread(target=refill_word_cache, daemon=True).start()
+
+def sri_hash(content):
+    """Subresource integrity (sha384) hash of some content"""
+    return 'sha384-' + base64.b64encode(hashlib.sha384(content).digest()).decode()
+
+def build_assets(assets_dir=ASSETS_DIR):
+    """Fingerprint and precompress the static assets
+    
+    Returns a manifest mapping names like 'css/game.css' to hashed names like
+    'css/game.1a2b3c4d5e6f.css', and the hashed assets with their gzip variants.
+    """
+    manifest = {}
+    assets = {}
+    
+    for root, _, filenames in os.walk(assets_dir):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            name = os.path.relpath(path, assets_dir).replace(os.sep, '/')
+            base, ext = os.path.splitext(name)
+            if ext not in ASSET_TYPES:
+                continue
+            
+            with open(path, 'rb') as f:
+                content = f.read()
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            hashed_name = f"{base}.{digest}{ext}"
+            
+            manifest[name] = hashed_name
+            assets[hashed_name] = {
+                'content': content,
+                'gzip': gzip.compress(content, compresslevel=9, mtime=0),
+                'mimetype': ASSET_TYPES[ext],
+                'etag': digest,
+                'integrity': sri_hash(content)
+            }
+    
+    return manifest, assets
+
+asset_manifest, assets = build_assets()
+
+for name in ASSET_FALLBACKS:
+    if name not in asset_manifest:
+        print(f"Warning: {name} is not vendored, serving it from {ASSET_FALLBACKS[name][0]}")
+
+@app.template_global()
+def asset_url(name):
+    """URL of a static asset, fingerprinted when it exists locally"""
+    global asset_manifest, assets
+    
+    # Pick up edited assets without a restart while developing
+    if app.debug:
+        asset_manifest, assets = build_assets()
+    
+    if name in asset_manifest:
+        return url_for('asset', filename=asset_manifest[name])
+    if name in ASSET_FALLBACKS:
+        return ASSET_FALLBACKS[name][0]
+    return url_for('static', filename=name)
+
+@app.template_global()
+def asset_integrity(name):
+    """Subresource integrity hash for the URL asset_url gives, if known"""
+    if name in asset_manifest:
+        return assets[asset_manifest[name]]['integrity']
+    if name in ASSET_FALLBACKS:
+        return ASSET_FALLBACKS[name][1]
+    return None
+
+@app.cli.command('fetch-htmx')
+def fetch_htmx():
+    """Vendor the pinned htmx release into static/js"""
+    response = requests.get(HTMX_URL, timeout=30)
+    response.raise_for_status()
+    
+    # Vendored assets are cached for a year, so never save unexpected content
+    integrity = sri_hash(response.content)
+    if integrity != HTMX_INTEGRITY:
+        raise click.ClickException(
+            f"htmx {HTMX_VERSION} integrity mismatch: expected {HTMX_INTEGRITY}, got {integrity}"
+        )
+    
+    path = os.path.join(ASSETS_DIR, 'js', 'htmx.min.js')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(response.content)
+    print(f"Saved htmx {HTMX_VERSION} to {path}")
+
+def cacheable_page(template):
+    """Render a static HTML shell that browsers may cache and revalidate"""
+    response = Response(render_template(template))
+    response.headers['Cache-Control'] = PAGE_CACHE_CONTROL
+    response.add_etag()
+    return response.make_conditional(request)
+
+rate_limiter = SQLiteTokenBucketLimiter(RATE_LIMIT_DB) if RATE_LIMIT_DB else TokenBucketLimiter()
+rate_limit_middleware = RateLimitMiddleware(app.wsgi_app, rate_limiter)
+app.wsgi_app = rate_limit_middleware
+if TRUSTED_PROXIES:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXIES)
+
+@app.after_request
+def set_player_id(response):
+    """Give each browser a stable id for per-player rate limiting"""
+    # Only on API responses, so cacheable pages never carry a Set-Cookie
+    if PLAYER_COOKIE not in request.cookies and request.path.startswith('/api/'):
+        response.set_cookie(PLAYER_COOKIE, secrets.token_urlsafe(16),
+                            max_age=60 * 60 * 24 * 365, httponly=True, samesite='Lax')
+    return response
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return cacheable_page('index.html')
+
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    """Serve a fingerprinted asset, gzipped when the client accepts it"""
+    entry = assets.get(filename)
+    if entry is None:
+        abort(404)
+    
+    use_gzip = (request.accept_encodings['gzip'] > 0 and
+                len(entry['gzip']) < len(entry['content']))
+    response = Response(entry['gzip'] if use_gzip else entry['content'],
+                        mimetype=entry['mimetype'])
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.set_etag(f"{entry['etag']}-gzip" if use_gzip else entry['etag'])
+    return response.make_conditional(request)
 
 @app.route('/load-more')
 def load_more():
@@ -126,7 +712,7 @@ def load_more():
 
 @app.route('/commonality', methods=['GET'])
 def commonality():
-    return render_template('commonality.html')
+    return cacheable_page('commonality.html')
 
 @app.route('/api/display-text', methods=['POST'])
 def display_text():
@@ -143,8 +729,8 @@ def process_input():
     input_text = request.form.get('text', '').lower()
     target_word = session.get('target_word', '').lower()
     displayed = session.get('displayed_synonyms', [])
-    all_synonyms = session.get('synonyms', [])
-    remaining = [s for s in all_synonyms if s not in displayed]
+    all_clues = session.get('synonyms', []) + session.get('related', [])
+    remaining = [s for s in all_clues if s not in displayed]
     
     if not input_text.isalpha():
         return Response(
@@ -274,6 +860,9 @@ def game_state():
     """API endpoint to manage game state and button rendering"""
     game_active = session.get('game_active', False)
     
+    # Loaded with the page, so warm the cache before the first round starts
+    prefetch_word_cache()
+    
     if game_active:
         return """
             <button class="game-button reset" 
@@ -305,25 +894,8 @@ def toggle_game():
         session['word_cache'] = word_cache  # Restore word cache
         session.modified = True
         
-        return Response(
-            render_template_string("""
-            <div class="loading-message">
-                <h2>Starting game...</h2>
-                <p>Retrieving words...</p>
-                <div class="loading-spinner"></div>
-            </div>
-            <script>
-                htmx.ajax('POST', '/api/start-game', {
-                    target: '#game-area',
-                    swap: 'innerHTML'
-                });
-            </script>
-            """),
-            headers={
-                "HX-Retarget": "#game-area",
-                "HX-Reswap": "innerHTML"
-            }
-        )
+        # Start the round in this same response
+        return start_game()
     else:  # Resetting game
         session.clear()  # This will clear everything including word cache
         session.modified = True
@@ -359,10 +931,11 @@ def toggle_game():
 @app.route('/api/start-game', methods=['POST'])
 def start_game():
     """Initialize a new game"""
-    global word_cache
-    
-    # Check cache at the start of each round
-    if not ensure_word_cache():
+    # Serve a prebuilt round, only building one now if the cache is empty
+    bundle = pop_round_bundle()
+    if bundle is None and ensure_word_cache():
+        bundle = pop_round_bundle()
+    if bundle is None:
         return Response(
             render_template_string("""
                 <div class="rules-section">
@@ -385,91 +958,7 @@ def start_game():
             }
         )
     
-    # Get the next word from the cache
-    with cache_lock:
-        word_data = word_cache.pop(0)
-    print(f"\nUsing word from cache: {word_data['word']}")
-    print(f"Cache size after pop: {len(word_cache)}")
-
-    target_word = word_data['word']
-    synonyms = word_data['synonyms']
-    part_of_speech = word_data['part_of_speech']
-    
-    # Set up new game state
-    session['target_word'] = target_word
-    session['synonyms'] = synonyms
-    session['part_of_speech'] = part_of_speech
-    session['displayed_synonyms'] = []
-    session['game_active'] = True
-    session['guesses'] = []
-    
-    # Initialize multi-round stats if not exists
-    if 'correct_words' not in session:
-        session['correct_words'] = []
-        session['current_round'] = 1
-    
-    session.modified = True
-    
-    # Return the initial game UI without rules section
-    total_synonyms = len(synonyms)
-    return Response(
-        render_template_string("""
-        <!-- Game Area -->
-        <div class="game-container">
-            <!-- Display Area -->
-            <div class="display-section">
-                <h2 class="section-heading">The target word part of speech is {{ part_of_speech }}</h2>
-                <h2 class="section-heading">The synonyms are:</h2>
-                <div id="display-area"
-                     hx-trigger="load delay:100ms, every 7s"
-                     hx-post="/api/next-synonym"
-                     hx-swap="innerHTML">
-                    <div class="synonyms-container">
-                    </div>
-                    <div class="synonym-counter">Remaining clues: {{ total_synonyms }}</div>
-                </div>
-            </div>
-
-            <!-- Game Status -->
-            <div id="game-status"></div>
-
-            <!-- Input Area -->
-            <div class="input-section">
-                <h2>Guess the common parent word</h2>
-                <form hx-post="/api/process-input" 
-                      hx-target="#input-result"
-                      hx-on::after-request="this.reset()">
-                    <input type="text" 
-                           name="text" 
-                           placeholder="Enter text here..."
-                           pattern="[A-Za-z]+"
-                           title="Please enter only alphabetic characters"
-                           required>
-                    <button type="submit">Submit</button>
-                </form>
-                <div id="input-result"></div>
-            </div>
-
-            <!-- Game Control Section -->
-            <div class="game-control-section">
-                <div id="game-buttons">
-                    <button class="game-button reset" 
-                            hx-post="/api/toggle-game"
-                            hx-target="#game-buttons"
-                            hx-swap="innerHTML">
-                        Reset
-                    </button>
-                </div>
-            </div>
-        </div>
-        """, 
-        part_of_speech=part_of_speech,
-        total_synonyms=total_synonyms),
-        headers={
-            "HX-Retarget": "#game-area",
-            "HX-Reswap": "innerHTML"
-        }
-    )
+    return start_round(bundle)
 
 @app.route('/api/next-synonym', methods=['POST'])
 def next_synonym():
@@ -478,13 +967,23 @@ def next_synonym():
         return "", 204
     
     all_synonyms = session.get('synonyms', [])
+    related = session.get('related', [])
+    all_clues = all_synonyms + related
     displayed = session.get('displayed_synonyms', [])
     close_guess = session.get('close_guess', None)
     target_word = session.get('target_word', '')
-    remaining_count = len(all_synonyms) - len(displayed)
+    definition = session.get('definition')
+    remaining_count = len(all_clues) - len(displayed)
+    
+    # Out of word clues: give the definition as one last hint before ending
+    out_of_clues = len(displayed) >= len(all_clues)
+    if out_of_clues and definition and not session.get('definition_shown'):
+        session['definition_shown'] = True
+        session['close_guess'] = None
+        session.modified = True
     
-    # Check for game over condition first
-    if len(displayed) >= len(all_synonyms):
+    # Hint already given, so the game is over
+    elif out_of_clues:
         session['game_active'] = False
         correct_words = session.get('correct_words', [])
         final_round = session.get('current_round', 1)
@@ -535,9 +1034,11 @@ def next_synonym():
             }
         )
     
-    # Get next synonym if not showing a close guess
-    if not close_guess:
-        remaining = [s for s in all_synonyms if s not in displayed]
+    # Get next clue if not showing a close guess, falling back to
+    # related words once the synonyms run out
+    elif not close_guess:
+        remaining = ([s for s in all_synonyms if s not in displayed] or
+                     [s for s in related if s not in displayed])
         next_syn = random.choice(remaining)
         displayed.append(next_syn)
         session['displayed_synonyms'] = displayed
@@ -566,6 +1067,9 @@ def next_synonym():
                     {% endfor %}
                 </div>
             </div>
+            {% if definition_shown %}
+                <div class="definition-hint">Hint: {{ definition }}</div>
+            {% endif %}
             <div class="synonym-counter">Remaining clues: {{ remaining }}</div>
             <script>
                 document.getElementById('input-result').innerHTML = `
@@ -578,8 +1082,10 @@ def next_synonym():
             </script>
         """, 
         displayed=displayed, 
-        remaining=remaining_count - (0 if close_guess else 1),
-        close_guess=close_guess),
+        remaining=max(remaining_count - (0 if close_guess else 1), 0),
+        close_guess=close_guess,
+        definition=definition,
+        definition_shown=session.get('definition_shown')),
         headers={
             "HX-Reswap": "innerHTML",
             "HX-Retarget": "#display-area"
@@ -0,0 +1,20 @@
+import pytest
+import sys
+from pathlib import Path
+
+# Add the parent directory to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app import app, rate_limiter
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Start every test with full rate limit buckets"""
+    rate_limiter.buckets.clear()
+    yield
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from app import app, build_assets, sri_hash, HTMX_INTEGRITY
+
+def test_build_assets(tmp_path):
+    """Test assets get content-hashed names and gzip variants"""
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'css' / 'game.css').write_text('body { color: red; }' * 50)
+    (tmp_path / 'notes.txt').write_text('not an asset')
+    
+    manifest, assets = build_assets(str(tmp_path))
+    
+    assert list(manifest) == ['css/game.css']
+    hashed_name = manifest['css/game.css']
+    assert hashed_name.startswith('css/game.') and hashed_name.endswith('.css')
+    assert len(assets[hashed_name]['gzip']) < len(assets[hashed_name]['content'])
+
+def test_fingerprinted_asset_headers(client):
+    """Test hashed assets are immutable and served gzipped"""
+    page = client.get('/commonality')
+    assert page.headers['Cache-Control'] == 'public, max-age=300'
+    
+    url = page.data.decode().split('href="')[1].split('"')[0]
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    
+    assert response.status_code == 200
+    assert 'immutable' in response.headers['Cache-Control']
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+def test_sri_hash():
+    """Test integrity hashes use the sha384 SRI format"""
+    assert sri_hash(b'') == 'sha384-OLBgp1GsljhM2TJ+sbHjaiH9txEUvgdDTAzHv2P24donTt6/529l+9Ua0vFImLlb'
+
+def test_fetch_htmx_rejects_integrity_mismatch(tmp_path):
+    """Test tampered htmx downloads are never written into static"""
+    with patch('requests.get') as mock_get, patch('app.ASSETS_DIR', str(tmp_path)):
+        mock_get.return_value.content = b'alert("not htmx")'
+        
+        result = app.test_cli_runner().invoke(args=['fetch-htmx'])
+    
+    assert result.exit_code != 0
+    assert 'integrity mismatch' in result.output
+    assert not (tmp_path / 'js' / 'htmx.min.js').exists()
+
+def test_htmx_script_has_integrity(client):
+    """Test the htmx script tag is pinned with subresource integrity"""
+    response = client.get('/commonality')
+    
+    assert f'integrity="{HTMX_INTEGRITY}"'.encode() in response.data
+    assert b'crossorigin="anonymous"' in response.data
@@ -0,0 +1,81 @@
+from app import normalize_word_details, MAX_RELATED
+
+def test_normalize_word_details():
+    """Test extra clues are kept from the full details payload"""
+    details = {
+        'word': 'test',
+        'frequency': 4.5,
+        'results': [
+            {
+                'definition': 'a test of knowledge',
+                'partOfSpeech': 'noun',
+                'synonyms': ['exam', 'quiz'],
+                'typeOf': ['evaluation', 'test case']
+            },
+            {
+                'definition': 'trying something',
+                'partOfSpeech': 'noun',
+                'synonyms': ['trial', 'exam'],
+                'similarTo': ['experimental']
+            }
+        ]
+    }
+    
+    result = normalize_word_details('test', details)
+    
+    assert result['synonyms'] == ['exam', 'quiz']
+    assert result['related'] == ['trial', 'experimental', 'evaluation']
+    assert result['definition'] == 'a ____ of knowledge'
+    assert len(result['senses']) == 2
+
+def test_normalize_word_details_no_synonyms():
+    """Test payloads without any synonyms are rejected"""
+    details = {'word': 'test', 'results': [{'partOfSpeech': 'noun', 'typeOf': ['exam']}]}
+    
+    assert normalize_word_details('test', details) is None
+
+def test_normalize_word_details_only_self_synonym():
+    """Test a word whose only synonym is itself is rejected"""
+    details = {
+        'word': 'run',
+        'results': [{
+            'partOfSpeech': 'verb',
+            'synonyms': ['run'],
+            'similarTo': ['dash', 'sprint', 'race', 'hurry', 'jog']
+        }]
+    }
+    
+    assert normalize_word_details('run', details) is None
+
+def test_normalize_word_details_caps_related():
+    """Test related clues are capped, same part of speech senses first"""
+    details = {
+        'word': 'run',
+        'results': [
+            {'partOfSpeech': 'verb', 'synonyms': ['go', 'race']},
+            {'partOfSpeech': 'noun', 'synonyms': ['streak'],
+             'similarTo': [f'similar{i}' for i in range(300)]},
+            {'partOfSpeech': 'verb', 'synonyms': ['flee']}
+        ]
+    }
+    
+    result = normalize_word_details('run', details)
+    
+    assert len(result['related']) == MAX_RELATED
+    assert result['related'][:2] == ['flee', 'streak']
+
+def test_definition_hint_before_game_over(client):
+    """Test the definition is shown once all word clues are used up"""
+    with client.session_transaction() as session:
+        session['game_active'] = True
+        session['target_word'] = 'test'
+        session['synonyms'] = ['syn1', 'syn2']
+        session['related'] = ['rel1']
+        session['definition'] = 'a ____ of knowledge'
+        session['displayed_synonyms'] = ['syn1', 'syn2', 'rel1']
+    
+    response = client.post('/api/next-synonym')
+    assert b'a ____ of knowledge' in response.data
+    
+    response = client.post('/api/next-synonym')
+    assert b'Game Over' in response.data
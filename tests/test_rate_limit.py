@@ -0,0 +1,130 @@
+import pytest
+from unittest.mock import patch
+
+from app import (
+    TokenBucketLimiter,
+    SQLiteTokenBucketLimiter,
+    WORKER_LOAD_SHED_THRESHOLD,
+    rate_limit_middleware
+)
+
+def test_token_bucket_limiter():
+    """Test buckets allow a burst and then reject"""
+    limiter = TokenBucketLimiter()
+    
+    results = [limiter.allow('key', 3, 0.01) for _ in range(4)]
+    
+    assert results == [True, True, True, False]
+    assert limiter.allow('other', 3, 0.01) is True
+
+def test_token_bucket_limiter_caps_buckets():
+    """Test the least recently used buckets are evicted past the cap"""
+    limiter = TokenBucketLimiter()
+    limiter.MAX_BUCKETS = 2
+    
+    limiter.allow('a', 3, 0.01)
+    limiter.allow('b', 3, 0.01)
+    limiter.allow('a', 3, 0.01)
+    limiter.allow('c', 3, 0.01)
+    
+    assert list(limiter.buckets) == ['a', 'c']
+
+def test_sqlite_token_bucket_limiter(tmp_path):
+    """Test buckets are shared through the SQLite backend"""
+    path = str(tmp_path / 'buckets.db')
+    first = SQLiteTokenBucketLimiter(path)
+    second = SQLiteTokenBucketLimiter(path)
+    
+    assert first.allow('key', 2, 0.01) is True
+    assert second.allow('key', 2, 0.01) is True
+    assert first.allow('key', 2, 0.01) is False
+
+def test_sqlite_token_bucket_limiter_allow_all(tmp_path):
+    """Test several buckets are checked together, stopping at the first empty one"""
+    limiter = SQLiteTokenBucketLimiter(str(tmp_path / 'buckets.db'))
+    
+    journal_mode = limiter._connect().execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == 'wal'
+    
+    assert limiter.allow_all([('ip', 1, 0.01), ('player', 5, 0.01)]) is True
+    assert limiter.allow_all([('ip', 1, 0.01), ('player', 5, 0.01)]) is False
+    
+    # The player bucket is untouched once the IP bucket rejects
+    tokens = limiter._connect().execute(
+        "SELECT tokens FROM buckets WHERE key = 'player'"
+    ).fetchone()[0]
+    assert tokens == pytest.approx(4, abs=0.01)
+
+def test_sqlite_token_bucket_limiter_cleanup(tmp_path):
+    """Test idle buckets are deleted from the SQLite backend"""
+    limiter = SQLiteTokenBucketLimiter(str(tmp_path / 'buckets.db'))
+    limiter.CLEANUP_EVERY = 3
+    limiter.IDLE_SECONDS = 0
+    
+    for key in ['a', 'b', 'c']:
+        limiter.allow(key, 2, 0.01)
+    
+    count = limiter._connect().execute("SELECT COUNT(*) FROM buckets").fetchone()[0]
+    assert count == 1
+
+def test_rate_limit_rejects_excess_requests(client):
+    """Test flooding an endpoint gets an htmx-friendly 429"""
+    client.set_cookie('player_id', 'flooder')
+    
+    responses = [client.post('/api/process-input', data={'text': 'guess'})
+                 for _ in range(15)]
+    rejected = [r for r in responses if r.status_code == 429]
+    
+    assert rejected
+    assert rejected[0].headers['HX-Retarget'] == '#game-status'
+    assert 'Retry-After' in rejected[0].headers
+    assert b'Slow down' in rejected[0].data
+
+def test_rate_limit_ignores_untrusted_forwarded_for(client):
+    """Test rotating X-Forwarded-For does not dodge the per-IP limit"""
+    with patch('app.ensure_word_cache', return_value=False):
+        statuses = [
+            client.post('/api/start-game',
+                        headers={'X-Forwarded-For': f'10.0.0.{i}'},
+                        environ_base={'REMOTE_ADDR': '192.0.2.1'}).status_code
+            for i in range(30)
+        ]
+    
+    assert 429 in statuses
+
+@pytest.fixture
+def overloaded():
+    """Pretend the worker is at its load shedding threshold"""
+    rate_limit_middleware.in_flight = WORKER_LOAD_SHED_THRESHOLD
+    yield
+    rate_limit_middleware.in_flight = 0
+
+def test_load_shedding_rejects_new_games(client, overloaded):
+    """Test new games are shed when the worker is overloaded"""
+    client.set_cookie('player_id', 'player')
+    
+    response = client.post('/api/toggle-game')
+    
+    assert response.status_code == 503
+    assert response.headers['HX-Retarget'] == '#game-area'
+    assert b'busy' in response.data
+
+def test_load_shedding_rejects_cookieless_clients(client, overloaded):
+    """Test clients without a player cookie are shed when overloaded"""
+    response = client.post('/api/next-synonym')
+    
+    assert response.status_code == 503
+
+def test_load_shedding_keeps_serving_players(client, overloaded):
+    """Test players mid-game are still served when overloaded"""
+    client.set_cookie('player_id', 'player')
+    with client.session_transaction() as session:
+        session['game_active'] = True
+        session['target_word'] = 'test'
+        session['synonyms'] = ['syn1', 'syn2', 'syn3']
+        session['displayed_synonyms'] = ['syn1']
+    
+    response = client.post('/api/next-synonym')
+    
+    assert response.status_code == 200
+    assert b'synonym-word' in response.data
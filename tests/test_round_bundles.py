@@ -0,0 +1,87 @@
+from threading import Thread
+from unittest.mock import patch
+
+import app as game
+from app import build_round_bundle, normalize_word_details
+
+def make_word(word):
+    return {
+        'word': word,
+        'part_of_speech': 'noun',
+        'synonyms': ['exam', 'trial', 'assessment', 'evaluation', 'examination'],
+        'related': ['quiz']
+    }
+
+def test_toggle_game_serves_prebuilt_round(client):
+    """Test starting a game returns a playable round in one response"""
+    bundle = build_round_bundle(make_word('test'))
+    
+    with patch('app.word_cache', [bundle]), patch('app.prefetch_word_cache') as mock_prefetch:
+        response = client.post('/api/toggle-game')
+    
+    first_clue = bundle['state']['displayed_synonyms'][0]
+    assert response.headers['HX-Retarget'] == '#game-area'
+    assert first_clue.encode() in response.data
+    assert b'Remaining clues: 5' in response.data
+    assert mock_prefetch.called
+    with client.session_transaction() as session:
+        assert session['game_active'] is True
+        assert session['target_word'] == 'test'
+        assert session['displayed_synonyms'] == [first_clue]
+
+def test_toggle_game_builds_round_when_cache_empty(client):
+    """Test an empty cache still starts the round in the same response"""
+    with patch('app.word_cache', []), \
+         patch('app.prefetch_word_cache'), \
+         patch('app.get_multiple_words', return_value=[make_word('test')]):
+        response = client.post('/api/toggle-game')
+    
+    assert b'htmx.ajax' not in response.data
+    assert b'Remaining clues: 5' in response.data
+
+def test_prefetch_word_cache_refills_in_background():
+    """Test a low cache is topped up off the response path"""
+    threads = []
+    
+    def start_thread(*args, **kwargs):
+        thread = Thread(*args, **kwargs)
+        threads.append(thread)
+        return thread
+    
+    with patch('app.word_cache', []), \
+         patch('app.Thread', side_effect=start_thread), \
+         patch('app.get_multiple_words', return_value=[make_word('test')]):
+        game.prefetch_word_cache()
+        
+        # Wait for the background refill to finish
+        for thread in threads:
+            thread.join()
+        assert len(threads) == 1
+        assert [b['word'] for b in game.word_cache] == ['test']
+
+def test_prefetch_word_cache_skips_full_cache():
+    """Test no refill is started while the cache is well stocked"""
+    full_cache = [build_round_bundle(make_word(f'word{i}')) for i in range(6)]
+    
+    with patch('app.word_cache', full_cache), patch('app.Thread') as mock_thread:
+        game.prefetch_word_cache()
+    
+    assert not mock_thread.called
+
+def test_round_bundle_keeps_word_details():
+    """Test cached bundles still hold the normalized details payload"""
+    word_data = normalize_word_details('test', {
+        'word': 'test',
+        'frequency': 4.5,
+        'results': [
+            {'partOfSpeech': 'noun', 'synonyms': ['exam', 'quiz', 'trial']},
+            {'partOfSpeech': 'verb', 'synonyms': ['try', 'check']}
+        ]
+    })
+    
+    with patch('app.word_cache', [build_round_bundle(word_data)]):
+        bundle = game.pop_round_bundle()
+    
+    assert bundle['details']['frequency'] == 4.5
+    assert len(bundle['details']['senses']) == 2
+    assert 'senses' not in bundle['state']